@@ -1,12 +1,35 @@
 import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow is optional; fall back to pandas' CSV writer
+    pa = None
 
 # Configuration for real-time sensor data: 60 days, every 30 minutes
 START_DATE = datetime(2025, 6, 1, 0, 0, 0)
 DURATION_DAYS = 60
 MEASUREMENT_INTERVAL_MINUTES = 30
-NUM_DATA_POINTS = int((DURATION_DAYS * 24 * 60) / MEASUREMENT_INTERVAL_MINUTES)
+# Samples per day; anomaly offsets and durations are converted with integer
+# arithmetic, which needs a whole number of samples per day
+if (24 * 60) % MEASUREMENT_INTERVAL_MINUTES != 0:
+    raise ValueError('MEASUREMENT_INTERVAL_MINUTES must divide 1440 (minutes per day)')
+IDX_PER_DAY = (24 * 60) // MEASUREMENT_INTERVAL_MINUTES
+NUM_DATA_POINTS = DURATION_DAYS * IDX_PER_DAY
+
+# Random number generator (PCG64); fixed seed so runs are reproducible
+RANDOM_SEED = 0
+rng = np.random.default_rng(RANDOM_SEED)
+
+# Sensor readings are stored as float32; their precision (pH to 0.01, turbidity
+# to 0.1 NTU) is well within float32's ~7 significant digits
+SENSOR_DTYPE = np.float32
+
+# Decimal places written per reading in the CSV; sensor precision is 2-3 decimals
+CSV_FLOAT_DECIMALS = 3
 
 # Water quality parameters based on SANS 241:2015
 PH_MEAN = 7.5
@@ -91,132 +114,152 @@ ANOMALY_TOC_DURATION_HOURS = 20
 ANOMALY_TOC_SPIKE_VALUE = 15.0
 
 # Generate timestamps
-timestamps = [START_DATE + timedelta(minutes=i * MEASUREMENT_INTERVAL_MINUTES)
-              for i in range(NUM_DATA_POINTS)]
-time_in_hours = np.array([(t - START_DATE).total_seconds() / 3600 for t in timestamps])
-
-# Generate synthetic data with normal fluctuations
-ph_data = np.zeros(NUM_DATA_POINTS)
-turbidity_data = np.zeros(NUM_DATA_POINTS)
-tds_data = np.zeros(NUM_DATA_POINTS)
-conductivity_data = np.zeros(NUM_DATA_POINTS)
-colour_data = np.zeros(NUM_DATA_POINTS)
-chlorine_data = np.zeros(NUM_DATA_POINTS)
-nitrate_data = np.zeros(NUM_DATA_POINTS)
-ammonia_data = np.zeros(NUM_DATA_POINTS)
-toc_data = np.zeros(NUM_DATA_POINTS)
-
-for i in range(NUM_DATA_POINTS):
-    ph_data[i] = np.random.normal(PH_MEAN, PH_STD_DEV)
-    turbidity_data[i] = np.random.normal(TURBIDITY_NORMAL_MEAN, TURBIDITY_NORMAL_STD_DEV)
-    tds_data[i] = np.random.normal(TDS_MEAN, TDS_STD_DEV)
-    conductivity_data[i] = np.random.normal(CONDUCTIVITY_NORMAL_MEAN, CONDUCTIVITY_STD_DEV)
-    colour_data[i] = np.random.normal(COLOUR_NORMAL_MEAN, COLOUR_STD_DEV)
-    chlorine_data[i] = np.random.normal(CHLORINE_NORMAL_MEAN, CHLORINE_STD_DEV)
-    nitrate_data[i] = np.random.normal(NITRATE_NORMAL_MEAN, NITRATE_STD_DEV)
-    ammonia_data[i] = np.random.normal(AMMONIA_NORMAL_MEAN, AMMONIA_STD_DEV)
-    toc_data[i] = np.random.normal(TOC_NORMAL_MEAN, TOC_STD_DEV)
+timestamps = pd.date_range(START_DATE, periods=NUM_DATA_POINTS, freq=f'{MEASUREMENT_INTERVAL_MINUTES}min')
+
+# Generate synthetic data with normal fluctuations: one (9, N) standard-normal
+# draw, scaled and shifted per parameter row
+parameter_means = np.array([PH_MEAN, TURBIDITY_NORMAL_MEAN, TDS_MEAN, CONDUCTIVITY_NORMAL_MEAN, COLOUR_NORMAL_MEAN,
+                            CHLORINE_NORMAL_MEAN, NITRATE_NORMAL_MEAN, AMMONIA_NORMAL_MEAN, TOC_NORMAL_MEAN],
+                           dtype=SENSOR_DTYPE)
+parameter_std_devs = np.array([PH_STD_DEV, TURBIDITY_NORMAL_STD_DEV, TDS_STD_DEV, CONDUCTIVITY_STD_DEV, COLOUR_STD_DEV,
+                               CHLORINE_STD_DEV, NITRATE_STD_DEV, AMMONIA_STD_DEV, TOC_STD_DEV],
+                              dtype=SENSOR_DTYPE)
+sensor_data = rng.standard_normal((len(parameter_means), NUM_DATA_POINTS), dtype=SENSOR_DTYPE)
+sensor_data *= parameter_std_devs[:, None]
+sensor_data += parameter_means[:, None]
+(ph_data, turbidity_data, tds_data, conductivity_data, colour_data,
+ chlorine_data, nitrate_data, ammonia_data, toc_data) = sensor_data
 
 # Inject anomalies
-# Turbidity spike (e.g., heavy rainfall)
-anomaly_turb_start_idx = int((ANOMALY_TURBIDITY_START_DAY * 24 * 60) / MEASUREMENT_INTERVAL_MINUTES)
-anomaly_turb_end_idx = min(anomaly_turb_start_idx + int((ANOMALY_TURBIDITY_DURATION_HOURS * 60) / MEASUREMENT_INTERVAL_MINUTES), NUM_DATA_POINTS)
-if anomaly_turb_start_idx < NUM_DATA_POINTS:
-    turb_spike_indices = np.arange(anomaly_turb_start_idx, anomaly_turb_end_idx)
-    spike_profile = np.sin(np.linspace(0, np.pi, len(turb_spike_indices)))
-    turbidity_data[turb_spike_indices] = ANOMALY_TURBIDITY_SPIKE_VALUE * spike_profile + np.random.normal(0, 5, len(turb_spike_indices))
+_spike_profiles = {}
+
+
+def spike_profile(length):
+    # Half-sine rise and fall over the anomaly window, cached by window length
+    if length not in _spike_profiles:
+        _spike_profiles[length] = np.sin(np.linspace(0, np.pi, length, dtype=SENSOR_DTYPE))
+    return _spike_profiles[length]
+
+
+def anomaly_window(start_day, duration_hours):
+    start_idx = start_day * IDX_PER_DAY
+    end_idx = min(start_idx + (duration_hours * 60) // MEASUREMENT_INTERVAL_MINUTES, NUM_DATA_POINTS)
+    return start_idx, end_idx
+
+
+def add_noise(window, noise_std):
+    # Add N(0, noise_std) noise in place, drawn into the shared scratch buffer
+    noise = _anomaly_scratch[:len(window)]
+    rng.standard_normal(dtype=SENSOR_DTYPE, out=noise)
+    noise *= noise_std
+    window += noise
+
+
+def apply_spike(data, start_day, duration_hours, amplitude, noise_std):
+    start_idx, end_idx = anomaly_window(start_day, duration_hours)
+    if start_idx < NUM_DATA_POINTS:
+        window = data[start_idx:end_idx]
+        np.multiply(spike_profile(len(window)), amplitude, out=window)
+        add_noise(window, noise_std)
+
+
+# Half-sine spikes, passed to apply_spike() as keyword arguments
+spike_anomalies = (
+    # Turbidity spike (e.g., heavy rainfall)
+    dict(data=turbidity_data, start_day=ANOMALY_TURBIDITY_START_DAY,
+         duration_hours=ANOMALY_TURBIDITY_DURATION_HOURS,
+         amplitude=ANOMALY_TURBIDITY_SPIKE_VALUE, noise_std=5),
+    # TDS & Conductivity spike (e.g., saline intrusion)
+    dict(data=tds_data, start_day=ANOMALY_TDS_CONDUCTIVITY_START_DAY,
+         duration_hours=ANOMALY_TDS_CONDUCTIVITY_DURATION_HOURS,
+         amplitude=ANOMALY_TDS_SPIKE_VALUE, noise_std=50),
+    dict(data=conductivity_data, start_day=ANOMALY_TDS_CONDUCTIVITY_START_DAY,
+         duration_hours=ANOMALY_TDS_CONDUCTIVITY_DURATION_HOURS,
+         amplitude=ANOMALY_CONDUCTIVITY_SPIKE_VALUE, noise_std=10),
+    # Colour spike (e.g., algal bloom)
+    dict(data=colour_data, start_day=ANOMALY_COLOUR_START_DAY,
+         duration_hours=ANOMALY_COLOUR_DURATION_HOURS,
+         amplitude=ANOMALY_COLOUR_SPIKE_VALUE, noise_std=5),
+    # Nitrate spike (e.g., agricultural runoff)
+    dict(data=nitrate_data, start_day=ANOMALY_NITRATE_START_DAY,
+         duration_hours=ANOMALY_NITRATE_DURATION_HOURS,
+         amplitude=ANOMALY_NITRATE_SPIKE_VALUE, noise_std=0.5),
+    # Ammonia spike (e.g., sewage ingress)
+    dict(data=ammonia_data, start_day=ANOMALY_AMMONIA_START_DAY,
+         duration_hours=ANOMALY_AMMONIA_DURATION_HOURS,
+         amplitude=ANOMALY_AMMONIA_SPIKE_VALUE, noise_std=0.1),
+    # TOC spike (e.g., organic pollution)
+    dict(data=toc_data, start_day=ANOMALY_TOC_START_DAY,
+         duration_hours=ANOMALY_TOC_DURATION_HOURS,
+         amplitude=ANOMALY_TOC_SPIKE_VALUE, noise_std=1.0),
+)
+
+# Reusable noise buffer, sized to the longest anomaly window that draws into it
+anomaly_windows = [anomaly_window(anomaly['start_day'], anomaly['duration_hours']) for anomaly in spike_anomalies]
+anomaly_windows.append(anomaly_window(ANOMALY_CHLORINE_START_DAY, ANOMALY_CHLORINE_DURATION_HOURS))
+_anomaly_scratch = np.empty(max(end_idx - start_idx for start_idx, end_idx in anomaly_windows), dtype=SENSOR_DTYPE)
+
+for anomaly in spike_anomalies:
+    apply_spike(**anomaly)
 
 # pH fluctuation (e.g., chemical spill)
-anomaly_ph_start_idx = int((ANOMALY_PH_START_DAY * 24 * 60) / MEASUREMENT_INTERVAL_MINUTES)
-anomaly_ph_end_idx = min(anomaly_ph_start_idx + int((ANOMALY_PH_DURATION_HOURS * 60) / MEASUREMENT_INTERVAL_MINUTES), NUM_DATA_POINTS)
+anomaly_ph_start_idx, anomaly_ph_end_idx = anomaly_window(ANOMALY_PH_START_DAY, ANOMALY_PH_DURATION_HOURS)
 if anomaly_ph_start_idx < NUM_DATA_POINTS:
-    ph_fluct_indices = np.arange(anomaly_ph_start_idx, anomaly_ph_end_idx)
-    ph_oscillation = ANOMALY_PH_SEVERITY_AMPLITUDE * np.sin(2 * np.pi * np.linspace(0, 2, len(ph_fluct_indices)))
-    for j, idx in enumerate(ph_fluct_indices):
-        ph_data[idx] = (ANOMALY_PH_HIGH_VALUE if j % 2 == 0 else ANOMALY_PH_LOW_VALUE) + ph_oscillation[j] * 0.5 + np.random.normal(0, 0.1)
-
-# TDS & Conductivity spike (e.g., saline intrusion)
-anomaly_tds_cond_start_idx = int((ANOMALY_TDS_CONDUCTIVITY_START_DAY * 24 * 60) / MEASUREMENT_INTERVAL_MINUTES)
-anomaly_tds_cond_end_idx = min(anomaly_tds_cond_start_idx + int((ANOMALY_TDS_CONDUCTIVITY_DURATION_HOURS * 60) / MEASUREMENT_INTERVAL_MINUTES), NUM_DATA_POINTS)
-if anomaly_tds_cond_start_idx < NUM_DATA_POINTS:
-    tds_cond_spike_indices = np.arange(anomaly_tds_cond_start_idx, anomaly_tds_cond_end_idx)
-    spike_profile = np.sin(np.linspace(0, np.pi, len(tds_cond_spike_indices)))
-    tds_data[tds_cond_spike_indices] = ANOMALY_TDS_SPIKE_VALUE * spike_profile + np.random.normal(0, 50, len(tds_cond_spike_indices))
-    conductivity_data[tds_cond_spike_indices] = ANOMALY_CONDUCTIVITY_SPIKE_VALUE * spike_profile + np.random.normal(0, 10, len(tds_cond_spike_indices))
-
-# Colour spike (e.g., algal bloom)
-anomaly_colour_start_idx = int((ANOMALY_COLOUR_START_DAY * 24 * 60) / MEASUREMENT_INTERVAL_MINUTES)
-anomaly_colour_end_idx = min(anomaly_colour_start_idx + int((ANOMALY_COLOUR_DURATION_HOURS * 60) / MEASUREMENT_INTERVAL_MINUTES), NUM_DATA_POINTS)
-if anomaly_colour_start_idx < NUM_DATA_POINTS:
-    colour_spike_indices = np.arange(anomaly_colour_start_idx, anomaly_colour_end_idx)
-    spike_profile = np.sin(np.linspace(0, np.pi, len(colour_spike_indices)))
-    colour_data[colour_spike_indices] = ANOMALY_COLOUR_SPIKE_VALUE * spike_profile + np.random.normal(0, 5, len(colour_spike_indices))
+    ph_fluct_len = anomaly_ph_end_idx - anomaly_ph_start_idx
+    ph_oscillation = ANOMALY_PH_SEVERITY_AMPLITUDE * np.sin(2 * np.pi * np.linspace(0, 2, ph_fluct_len))
+    ph_base = np.where(np.arange(ph_fluct_len) % 2 == 0, ANOMALY_PH_HIGH_VALUE, ANOMALY_PH_LOW_VALUE)
+    ph_data[anomaly_ph_start_idx:anomaly_ph_end_idx] = ph_base + ph_oscillation * 0.5 + rng.normal(0, 0.1, ph_fluct_len)
 
 # Free Chlorine drop (e.g., disinfection failure)
-anomaly_chlorine_start_idx = int((ANOMALY_CHLORINE_START_DAY * 24 * 60) / MEASUREMENT_INTERVAL_MINUTES)
-anomaly_chlorine_end_idx = min(anomaly_chlorine_start_idx + int((ANOMALY_CHLORINE_DURATION_HOURS * 60) / MEASUREMENT_INTERVAL_MINUTES), NUM_DATA_POINTS)
+anomaly_chlorine_start_idx, anomaly_chlorine_end_idx = anomaly_window(ANOMALY_CHLORINE_START_DAY, ANOMALY_CHLORINE_DURATION_HOURS)
 if anomaly_chlorine_start_idx < NUM_DATA_POINTS:
-    chlorine_drop_indices = np.arange(anomaly_chlorine_start_idx, anomaly_chlorine_end_idx)
-    drop_profile = 1 - np.sin(np.linspace(0, np.pi, len(chlorine_drop_indices)))
-    chlorine_data[chlorine_drop_indices] = ANOMALY_CHLORINE_DROP_VALUE + (CHLORINE_NORMAL_MEAN - ANOMALY_CHLORINE_DROP_VALUE) * drop_profile + np.random.normal(0, 0.05, len(chlorine_drop_indices))
-
-# Nitrate spike (e.g., agricultural runoff)
-anomaly_nitrate_start_idx = int((ANOMALY_NITRATE_START_DAY * 24 * 60) / MEASUREMENT_INTERVAL_MINUTES)
-anomaly_nitrate_end_idx = min(anomaly_nitrate_start_idx + int((ANOMALY_NITRATE_DURATION_HOURS * 60) / MEASUREMENT_INTERVAL_MINUTES), NUM_DATA_POINTS)
-if anomaly_nitrate_start_idx < NUM_DATA_POINTS:
-    nitrate_spike_indices = np.arange(anomaly_nitrate_start_idx, anomaly_nitrate_end_idx)
-    spike_profile = np.sin(np.linspace(0, np.pi, len(nitrate_spike_indices)))
-    nitrate_data[nitrate_spike_indices] = ANOMALY_NITRATE_SPIKE_VALUE * spike_profile + np.random.normal(0, 0.5, len(nitrate_spike_indices))
-
-# Ammonia spike (e.g., sewage ingress)
-anomaly_ammonia_start_idx = int((ANOMALY_AMMONIA_START_DAY * 24 * 60) / MEASUREMENT_INTERVAL_MINUTES)
-anomaly_ammonia_end_idx = min(anomaly_ammonia_start_idx + int((ANOMALY_AMMONIA_DURATION_HOURS * 60) / MEASUREMENT_INTERVAL_MINUTES), NUM_DATA_POINTS)
-if anomaly_ammonia_start_idx < NUM_DATA_POINTS:
-    ammonia_spike_indices = np.arange(anomaly_ammonia_start_idx, anomaly_ammonia_end_idx)
-    spike_profile = np.sin(np.linspace(0, np.pi, len(ammonia_spike_indices)))
-    ammonia_data[ammonia_spike_indices] = ANOMALY_AMMONIA_SPIKE_VALUE * spike_profile + np.random.normal(0, 0.1, len(ammonia_spike_indices))
-
-# TOC spike (e.g., organic pollution)
-anomaly_toc_start_idx = int((ANOMALY_TOC_START_DAY * 24 * 60) / MEASUREMENT_INTERVAL_MINUTES)
-anomaly_toc_end_idx = min(anomaly_toc_start_idx + int((ANOMALY_TOC_DURATION_HOURS * 60) / MEASUREMENT_INTERVAL_MINUTES), NUM_DATA_POINTS)
-if anomaly_toc_start_idx < NUM_DATA_POINTS:
-    toc_spike_indices = np.arange(anomaly_toc_start_idx, anomaly_toc_end_idx)
-    spike_profile = np.sin(np.linspace(0, np.pi, len(toc_spike_indices)))
-    toc_data[toc_spike_indices] = ANOMALY_TOC_SPIKE_VALUE * spike_profile + np.random.normal(0, 1.0, len(toc_spike_indices))
-
-# Clip data to ensure realistic bounds
-ph_data = np.clip(ph_data, PH_MIN, PH_MAX)
-turbidity_data = np.clip(turbidity_data, TURBIDITY_MIN, TURBIDITY_MAX)
-tds_data = np.clip(tds_data, TDS_MIN, TDS_MAX)
-conductivity_data = np.clip(conductivity_data, CONDUCTIVITY_MIN, CONDUCTIVITY_MAX)
-colour_data = np.clip(colour_data, COLOUR_MIN, COLOUR_MAX)
-chlorine_data = np.clip(chlorine_data, CHLORINE_MIN, CHLORINE_MAX)
-nitrate_data = np.clip(nitrate_data, NITRATE_MIN, NITRATE_MAX)
-ammonia_data = np.clip(ammonia_data, AMMONIA_MIN, AMMONIA_MAX)
-toc_data = np.clip(toc_data, TOC_MIN, TOC_MAX)
+    # Dips from the normal mean to the drop value: MEAN - (MEAN - DROP) * sin
+    chlorine_window = chlorine_data[anomaly_chlorine_start_idx:anomaly_chlorine_end_idx]
+    np.multiply(spike_profile(len(chlorine_window)), ANOMALY_CHLORINE_DROP_VALUE - CHLORINE_NORMAL_MEAN, out=chlorine_window)
+    chlorine_window += CHLORINE_NORMAL_MEAN
+    add_noise(chlorine_window, 0.05)
+
+# Clip data to ensure realistic bounds (one pass over all parameters)
+lower_bounds = np.array([PH_MIN, TURBIDITY_MIN, TDS_MIN, CONDUCTIVITY_MIN, COLOUR_MIN,
+                         CHLORINE_MIN, NITRATE_MIN, AMMONIA_MIN, TOC_MIN], dtype=SENSOR_DTYPE)
+upper_bounds = np.array([PH_MAX, TURBIDITY_MAX, TDS_MAX, CONDUCTIVITY_MAX, COLOUR_MAX,
+                         CHLORINE_MAX, NITRATE_MAX, AMMONIA_MAX, TOC_MAX], dtype=SENSOR_DTYPE)
+np.clip(sensor_data, lower_bounds[:, None], upper_bounds[:, None], out=sensor_data)
 
 # Create DataFrame and save to CSV
-data = {
-    'timestamp': timestamps,
-    'pH': ph_data,
-    'turbidity_NTU': turbidity_data,
-    'tds_mg_L': tds_data,
-    'conductivity_mS_m': conductivity_data,
-    'colour_Pt_Co': colour_data,
-    'free_chlorine_mg_L': chlorine_data,
-    'nitrate_mg_L': nitrate_data,
-    'ammonia_mg_L': ammonia_data,
-    'toc_mg_L': toc_data
-}
-
-df = pd.DataFrame(data)
+# sensor_data rows are parameters, so its transpose maps directly onto the
+# DataFrame's single float block; copy=False keeps that block backed by
+# sensor_data (newer pandas copies ndarray input by default)
+columns = ['pH', 'turbidity_NTU', 'tds_mg_L', 'conductivity_mS_m', 'colour_Pt_Co',
+           'free_chlorine_mg_L', 'nitrate_mg_L', 'ammonia_mg_L', 'toc_mg_L']
+df = pd.DataFrame(sensor_data.T, columns=columns, copy=False)
+df.insert(0, 'timestamp', timestamps)
 output_filename = '/Users/alhena/Downloads/Virtual_Intern_Water/real_time_simulated_sensor_data_SANS_adapted_v3.csv'
-df.to_csv(output_filename, index=False)
+# Both writers produce the same header, timestamps and values, but number
+# formatting depends on which one runs: pyarrow writes the shortest form
+# (2500, 0.43) and the pandas fallback pads to CSV_FLOAT_DECIMALS (2500.000, 0.430)
+if pa is not None:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # Second resolution keeps timestamps formatted as 'YYYY-MM-DD HH:MM:SS'
+    table = table.set_column(0, 'timestamp', table.column('timestamp').cast(pa.timestamp('s')))
+    # Round in float64: rounding the float32 values directly can round the
+    # wrong way (370.5995 is stored as 370.59948...), unlike '%.3f'
+    for i, name in enumerate(columns, start=1):
+        table = table.set_column(i, name, pc.round(table.column(name).cast(pa.float64()), CSV_FLOAT_DECIMALS))
+    # pyarrow quotes header names, and the quoting_header option only exists in
+    # recent versions; write the plain header ourselves so it matches df.to_csv
+    with open(output_filename, 'wb') as f:
+        f.write((','.join(table.column_names) + '\n').encode())
+        pacsv.write_csv(table, f, write_options=pacsv.WriteOptions(include_header=False))
+else:
+    # chunksize is a no-op at the default 2,880 rows; it bounds the formatter's
+    # working set when DURATION_DAYS is raised for longer runs
+    df.to_csv(output_filename, index=False, float_format=f'%.{CSV_FLOAT_DECIMALS}f', chunksize=4096)
 
 # Print confirmation and data preview
 print(f"Real-time synthetic sensor data (SANS-adapted v3) saved to {output_filename}")
 print("\nFirst 5 rows:")
-print(df.head())
+print(df.iloc[:5].to_string())
 print("\nLast 5 rows:")
-print(df.tail())
+print(df.iloc[-5:].to_string())
 print(f"\nTotal data points generated: {len(df)}")
\ No newline at end of file